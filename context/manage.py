@@ -3,8 +3,10 @@ Operations to populate and update LLM context
 """
 
 from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+import shutil
 import urllib.request
 
 # current directory
@@ -23,29 +25,36 @@ CONTEXTS = [
     ),
 ]
 
-def refresh_context(contexts: Collection[ContextFile]) -> None:
-    """Fetch all context and store in local folder."""
-    print(f"Refreshing contexts in {CONTEXT_ROOT}...")
+def fetch_context(context: ContextFile) -> None:
+    """Fetch a single context file and store it in the local folder."""
+    destination = CONTEXT_ROOT / context.filename
+    print(f"Fetching {context.url} -> {destination}")
+
+    try:
+        with urllib.request.urlopen(context.url) as response:
+            if response.status != 200:
+                print(f"Failed to download {context.url}: Status {response.status}")
+                return
 
-    for context in contexts:
-        destination = CONTEXT_ROOT / context.filename
-        print(f"Fetching {context.url} -> {destination}")
+            # Stream the body straight to disk in chunks instead of
+            # buffering the whole response in memory first
+            with open(destination, "wb") as f:
+                shutil.copyfileobj(response, f, length=1 << 20)
 
-        try:
-            with urllib.request.urlopen(context.url) as response:
-                if response.status != 200:
-                    print(f"Failed to download {context.url}: Status {response.status}")
-                    continue
+        print(f"Successfully saved {context.filename}")
 
-                content = response.read()
+    except Exception as e:
+        print(f"Error fetching {context.url}: {e}")
 
-                with open(destination, "wb") as f:
-                    f.write(content)
 
-            print(f"Successfully saved {context.filename}")
+def refresh_context(contexts: Collection[ContextFile]) -> None:
+    """Fetch all context concurrently and store in local folder."""
+    print(f"Refreshing contexts in {CONTEXT_ROOT}...")
 
-        except Exception as e:
-            print(f"Error fetching {context.url}: {e}")
+    # Downloads are independent and latency-bound, so fetch them in parallel;
+    # total wall time is the slowest endpoint instead of the sum
+    with ThreadPoolExecutor(max_workers=max(1, len(contexts))) as executor:
+        list(executor.map(fetch_context, contexts))
 
 
 if __name__ == "__main__":
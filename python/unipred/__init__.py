@@ -1,8 +1,9 @@
-from .core import UnipredCore
+from .core import UnipredCore, validate_ticker
+from .embedding_cache import EmbeddingCache
 from .market_quote_pb2 import MarketQuote, FetchedMarketList
 from .storage import LanceStore, MarketEmbedding
 
-__all__ = ["UnipredCore", "MarketQuote", "FetchedMarketList", "LanceStore", "MarketEmbedding"]
+__all__ = ["UnipredCore", "MarketQuote", "FetchedMarketList", "LanceStore", "MarketEmbedding", "EmbeddingCache", "validate_ticker"]
 
 def hello() -> str:
     # Deprecated helper function kept for backwards compatibility
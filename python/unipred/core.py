@@ -1,3 +1,5 @@
+import re
+
 try:
     from .unipred_py import UnipredCore as _UnipredCore
 except ImportError:
@@ -5,11 +7,40 @@ except ImportError:
 
 from .market_quote_pb2 import MarketQuote, FetchedMarketList
 
+# Compiled once at import; any shape the exchanges actually issue must match
+# one of these. Checking ~20 chars here is nanoseconds versus the ~100ms
+# HTTPS roundtrip a syntactically invalid ticker would otherwise cost.
+_TICKER_PATTERNS = (
+    # Kalshi series/event/market tickers; strike segments may hold decimal
+    # points (e.g. KXSUBWAY-26-4.19)
+    re.compile(r"[A-Z0-9]+(?:[-.][A-Z0-9]+)*\Z"),
+    re.compile(r"[0-9]+\Z"),                    # Polymarket token ids (decimal)
+    re.compile(r"0x[0-9a-fA-F]{64}\Z"),         # Polymarket condition ids
+)
+
+def validate_ticker(ticker: str) -> str | None:
+    """
+    Validates a ticker's syntax without touching the network.
+
+    Returns:
+        None if the ticker matches a known exchange format, otherwise a
+        human-readable reason string.
+    """
+    if not ticker:
+        return "Ticker is empty"
+    if any(p.fullmatch(ticker) for p in _TICKER_PATTERNS):
+        return None
+    return f"Ticker {ticker!r} does not match any known exchange format"
+
 class UnipredCore:
     def __init__(self, config: str) -> None:
         if _UnipredCore is None:
             raise ImportError("Failed to load native extension unipred_py")
         self._inner = _UnipredCore(config)
+        # Reused messages for the hot fetch paths; parsing into an existing
+        # message skips a Python-side allocation per call
+        self._quote_msg = MarketQuote()
+        self._market_list_msg = FetchedMarketList()
 
     def login(self, email: str, password: str) -> None:
         """
@@ -23,6 +54,15 @@ class UnipredCore:
         """
         self._inner.login_apikey(key_id, private_key_path)
 
+    def login_apikey_pem(self, key_id: str, pem: str) -> None:
+        """
+        Authenticates using an API key and the PEM-encoded private key itself.
+
+        Prefer this over login_apikey() when the key is already in memory
+        (e.g. an environment variable); it avoids writing the secret to disk.
+        """
+        self._inner.login_apikey_pem(key_id, pem)
+
     def fetch_markets(
         self,
         exchange: str | None = None,
@@ -32,25 +72,64 @@ class UnipredCore:
     ) -> FetchedMarketList:
         """
         Fetches markets with filtering options.
+
+        Note:
+            The returned message is reused across calls on this instance (and
+            therefore not thread-safe); call CopyFrom if you need to keep it
+            past the next fetch.
         """
         bytes_data = self._inner._fetch_markets_bytes(
             exchange, limit, cursor, status
         )
-        market_list = FetchedMarketList()
-        market_list.ParseFromString(bytes_data)
-        return market_list
+        self._market_list_msg.Clear()
+        self._market_list_msg.MergeFromString(bytes_data)
+        return self._market_list_msg
+
+    def fetch_markets_arrow(
+        self,
+        exchange: str | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        status: str | None = None,
+    ) -> "tuple[pyarrow.Table, str | None]":
+        """
+        Fetches markets as a columnar pyarrow Table.
+
+        The Rust core serializes the page as an Arrow IPC stream, so bulk
+        consumers (DuckDB, pandas) can register the table directly instead of
+        iterating protobuf messages field by field.
+
+        Returns:
+            A (table, cursor) tuple; cursor is None on the last page.
+        """
+        import pyarrow as pa
+
+        buf = self._inner._fetch_markets_arrow(exchange, limit, cursor, status)
+        table = pa.ipc.open_stream(buf).read_all()
+        cursor_meta = (table.schema.metadata or {}).get(b"cursor")
+        return table, cursor_meta.decode() if cursor_meta else None
 
     def get_quote(self, ticker: str, exchange: str | None = None) -> MarketQuote:
         """
         Fetches a quote for the given ticker.
-        
+
         Returns:
             MarketQuote: A Protobuf object containing the quote details.
+                The message is reused across calls on this instance (and
+                therefore not thread-safe); call CopyFrom if you need to
+                keep it past the next quote.
+
+        Raises:
+            ValueError: If the ticker is syntactically invalid, before any
+                network call is made.
         """
+        reason = validate_ticker(ticker)
+        if reason is not None:
+            raise ValueError(reason)
         bytes_data = self._inner._get_quote_bytes(ticker, exchange)
-        quote = MarketQuote()
-        quote.ParseFromString(bytes_data)
-        return quote
+        self._quote_msg.Clear()
+        self._quote_msg.MergeFromString(bytes_data)
+        return self._quote_msg
 
     def ingest_all(
         self,
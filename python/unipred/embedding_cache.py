@@ -0,0 +1,60 @@
+"""
+Content-addressed cache for document embeddings.
+
+Documents are keyed by a sha256 of their text, so identical
+"Title: ...\nDescription: ...\nOutcomes: ..." strings hit the cache no
+matter which script produced them first. Backed by shelve, which is in the
+standard library and good enough for the append-mostly access pattern here;
+vectors are stored as raw float32 bytes.
+"""
+
+import hashlib
+import shelve
+from typing import Callable, List
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = "unipred_emb_cache"
+
+class EmbeddingCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self._cache = shelve.open(path)
+
+    def close(self) -> None:
+        self._cache.close()
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def get_or_compute(
+        self,
+        texts: List[str],
+        encoder: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Return embeddings for texts, encoding only the ones not yet cached.
+
+        The encoder is called at most once, with the list of cache misses in
+        input order, so batched models still see one mini-batched call.
+        """
+        keys = [hashlib.sha256(t.encode()).hexdigest() for t in texts]
+        vectors = [None] * len(texts)
+
+        misses = []
+        for i, key in enumerate(keys):
+            if key in self._cache:
+                vectors[i] = np.frombuffer(self._cache[key], dtype=np.float32)
+            else:
+                misses.append(i)
+
+        if misses:
+            new_vectors = encoder([texts[i] for i in misses])
+            for i, vector in zip(misses, new_vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                self._cache[keys[i]] = vector.tobytes()
+                vectors[i] = vector
+
+        return np.vstack(vectors)
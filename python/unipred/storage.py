@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Any
+from typing import List, Any, Optional
 try:
     from .unipred_py import PyLanceDb as _PyLanceDb
 except ImportError:
@@ -37,29 +37,74 @@ class LanceStore:
         """
         self._inner.add_markets(markets)
 
+    def add_record_batch(self, batch: Any) -> None:
+        """
+        Add markets from a pyarrow RecordBatch in one call.
+
+        The batch must match the store schema:
+        (id, vector: FixedSizeList<float32>[384], ticker, source, title,
+        description, outcomes). This crosses the Python/Rust boundary once
+        for the whole batch, so prefer it over add_markets() for bulk loads.
+        """
+        import pyarrow as pa
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        self._inner.add_record_batch(sink.getvalue().to_pybytes())
+
     def create_index(self) -> None:
         """
         Create an IVF-PQ index for fast similarity search.
         """
         self._inner.create_index()
 
-    def search(self, query_vector: List[float], limit: int = 10) -> List[dict]:
+    def create_index_hnsw(self, m: int = 16, ef_construction: int = 200) -> None:
+        """
+        Create an IVF-HNSW-SQ index for fast similarity search.
+
+        Graph search scales O(log n) with corpus size at ~95-99% recall,
+        which wins over IVF-PQ's cluster probing on large corpora. The
+        defaults (m=16 edges per node, ef_construction=200) are the usual
+        recall/build-time trade-off; tune search breadth per query with
+        the ef_search argument to search().
+        """
+        self._inner.create_index_hnsw(m, ef_construction)
+
+    def search(self, query_vector: List[float], limit: int = 10,
+               ef_search: Optional[int] = None) -> List[dict]:
         """
         Search for similar markets.
         Returns a list of dictionaries with market metadata.
+
+        ef_search widens the HNSW candidate list (e.g. 50); None keeps the
+        engine default and is ignored for flat or IVF-PQ search.
         """
         # The Rust extension returns a list of tuples:
-        # (id, ticker, source, title, description, outcomes)
-        results = self._inner.search(query_vector, limit)
-        
-        return [
-            {
-                "id": r[0],
-                "ticker": r[1],
-                "source": r[2],
-                "title": r[3],
-                "description": r[4],
-                "outcomes": r[5]
-            }
-            for r in results
-        ]
\ No newline at end of file
+        # (id, ticker, source, title, description, outcomes, distance)
+        results = self._inner.search(query_vector, limit, ef_search)
+        return [_market_dict(r) for r in results]
+
+    def search_batch(self, query_vectors: List[List[float]], limit: int = 10,
+                     ef_search: Optional[int] = None) -> List[List[dict]]:
+        """
+        Search for similar markets for a batch of query vectors in one call.
+
+        The Rust side opens the table once and runs the queries concurrently,
+        so this is much cheaper than calling search() per vector.
+        Returns one result list per query, in input order.
+        """
+        batches = self._inner.search_batch(query_vectors, limit, ef_search)
+        return [[_market_dict(r) for r in results] for results in batches]
+
+
+def _market_dict(r: tuple) -> dict:
+    return {
+        "id": r[0],
+        "ticker": r[1],
+        "source": r[2],
+        "title": r[3],
+        "description": r[4],
+        "outcomes": r[5],
+        "distance": r[6]
+    }
\ No newline at end of file
@@ -2,6 +2,7 @@ class UnipredCore:
     def __init__(self, config: str) -> None: ...
     def login(self, email: str, password: str) -> None: ...
     def login_apikey(self, key_id: str, private_key_path: str) -> None: ...
+    def login_apikey_pem(self, key_id: str, pem: str) -> None: ...
     def _fetch_markets_bytes(
         self,
         exchange: str | None = None,
@@ -9,6 +10,13 @@ class UnipredCore:
         cursor: str | None = None,
         status: str | None = None,
     ) -> bytes: ...
+    def _fetch_markets_arrow(
+        self,
+        exchange: str | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        status: str | None = None,
+    ) -> bytes: ...
     def _get_quote_bytes(self, ticker: str, exchange: str | None = None) -> bytes: ...
     def ingest_all(
         self,
@@ -23,7 +31,12 @@ class PyLanceDb:
     @staticmethod
     def connect(uri: str) -> PyLanceDb: ...
     def add_markets(self, markets: list[object]) -> None: ...
+    def add_record_batch(self, data: bytes) -> None: ...
     def create_index(self) -> None: ...
+    def create_index_hnsw(self, m: int, ef_construction: int) -> None: ...
     def search(
-        self, query_vector: list[float], limit: int
-    ) -> list[tuple[str, str, str, str, str, str]]: ...
\ No newline at end of file
+        self, query_vector: list[float], limit: int, ef_search: int | None = None
+    ) -> list[tuple[str, str, str, str, str, str, float]]: ...
+    def search_batch(
+        self, query_vectors: list[list[float]], limit: int, ef_search: int | None = None
+    ) -> list[list[tuple[str, str, str, str, str, str, float]]]: ...
\ No newline at end of file
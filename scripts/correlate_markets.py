@@ -1,92 +1,214 @@
 import os
 import sys
+import hashlib
+import shutil
 import argparse
 import duckdb
+import numpy as np
 import pandas as pd
-import datetime
+import torch
 from typing import List, Optional
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from unipred import UnipredCore
+from unipred import UnipredCore, LanceStore, MarketEmbedding
 
 # Database file path
 DB_PATH = "new_markets.db"
 
+# LanceDB directory for the ANN correlation path
+LANCE_PATH = "correlate_lance_db"
+
+# Above this many candidate pairs, the dense NxM similarity matrix stops
+# fitting comfortably in memory and we switch to ANN search over LanceDB
+ANN_PAIR_LIMIT = 10_000_000
+
+# Number of nearest neighbours to pull per Kalshi market on the ANN path
+ANN_TOP_K = 20
+
+# LanceDB directory populated by the Rust ingestion engine
+INGEST_LANCE_PATH = "lancedb_data"
+
+# all-MiniLM-L6-v2 output dimension
+EMBEDDING_DIM = 384
+
 def init_db(con: duckdb.DuckDBPyConnection):
-    """Initialize the markets table."""
+    """Initialize the markets table (same schema the Rust ingestion engine uses)."""
     con.execute("""
         CREATE TABLE IF NOT EXISTS markets (
             ticker VARCHAR,
+            source VARCHAR,
             title VARCHAR,
+            status VARCHAR,
             description VARCHAR,
             outcomes VARCHAR,
-            source VARCHAR,
-            status VARCHAR,
-            ingested_at TIMESTAMP,
+            start_date VARCHAR,
+            end_date VARCHAR,
+            volume VARCHAR,
+            liquidity VARCHAR,
+            url VARCHAR,
+            ingested_at TIMESTAMP DEFAULT current_timestamp,
             PRIMARY KEY (ticker, source)
         )
     """)
+    # Embedding cache: embeddings are a pure function of the document text,
+    # so they are keyed by a hash of it and reused across runs
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS market_embeddings (
+            key BLOB PRIMARY KEY,
+            vec FLOAT[{EMBEDDING_DIM}]
+        )
+    """)
 
-def ingest_markets(core: UnipredCore, con: duckdb.DuckDBPyConnection, exchange: str, status: Optional[str] = None):
-    """Fetch markets from an exchange and store them in DuckDB."""
-    print(f"Ingesting markets from {exchange} (status={status})...")
-    
-    cursor = None
-    total_ingested = 0
-    batch_size = 100
-    
-    while True:
-        try:
-            # Fetch markets using the python wrapper
-            # Note: The underlying rust implementation maps None status differently for each exchange.
-            response = core.fetch_markets(exchange=exchange, limit=batch_size, cursor=cursor, status=status)
-            
-            if not response.markets:
-                break
-                
-            # Prepare data for insertion
-            data = []
-            now = datetime.datetime.now()
-            for m in response.markets:
-                # Clean title: sometimes it might be None or empty
-                title = m.title if m.title else "Unknown"
-                desc = m.description if m.description else ""
-                outcomes = ", ".join(m.outcomes) if m.outcomes else ""
-                data.append((m.ticker, title, desc, outcomes, m.source, m.status, now))
-            
-            # Upsert into DuckDB
-            # We use INSERT OR REPLACE to update existing entries
-            con.executemany("""
-                INSERT OR REPLACE INTO markets (ticker, title, description, outcomes, source, status, ingested_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, data)
-            
-            count = len(data)
-            total_ingested += count
-            print(f"  Fetched {count} markets. Total: {total_ingested}")
-            
-            # Update cursor for next batch
-            if response.cursor:
-                cursor = response.cursor
-            else:
-                break
-
-            # Safety break for development to avoid infinite loops if API misbehaves
-            # or massive data loads if not intended.
-            if total_ingested > 5000:
-                print("  Reached safety limit of 5000 markets per ingestion call.")
-                break
-                
-        except Exception as e:
-            print(f"Error fetching from {exchange}: {e}")
-            break
-            
-    print(f"Finished ingesting {exchange}.")
+def ingest_markets(core: UnipredCore, exchanges: Optional[List[str]] = None, statuses: Optional[List[str]] = None):
+    """Ingest markets into DuckDB via the Rust ingestion engine.
+
+    The correlation step only needs the shared markets table, so the whole
+    page loop (fetch, protobuf decode, upsert) stays inside Rust and DuckDB's
+    C++ engine instead of round-tripping each page through Python.
+    """
+    exchanges = exchanges or ["kalshi", "polymarket"]
+    statuses = statuses or ["active", "closed"]
+    print(f"Ingesting markets from {exchanges} (statuses={statuses})...")
+
+    try:
+        core.ingest_all(
+            db_path=DB_PATH,
+            lancedb_path=INGEST_LANCE_PATH,
+            exchanges=exchanges,
+            statuses=statuses,
+        )
+    except Exception as e:
+        print(f"Error ingesting markets: {e}")
+        return
+
+    print("Finished ingesting.")
+
+def encode_cached(model: SentenceTransformer, con: duckdb.DuckDBPyConnection, texts: List[str]) -> np.ndarray:
+    """Encode texts, reusing embeddings cached in DuckDB for unchanged documents."""
+    keys = [hashlib.sha256(t.encode()).digest() for t in texts]
+
+    # Look up which keys are already cached
+    con.register("keys_df", pd.DataFrame({'key': keys}))
+    rows = con.execute("""
+        SELECT e.key, e.vec
+        FROM market_embeddings e
+        JOIN keys_df k ON e.key = k.key
+    """).fetchall()
+    con.unregister("keys_df")
+    cache = {bytes(key): vec for key, vec in rows}
+
+    # Encode only the misses (dedup repeated texts within the batch)
+    misses = {}
+    for i, key in enumerate(keys):
+        if key not in cache:
+            misses.setdefault(key, i)
+
+    if misses:
+        print(f"Encoding {len(misses)} new documents ({len(texts) - len(misses)} cached)...")
+        # Encode the full miss list in one call so sentence-transformers can
+        # sort by length internally and pad per-batch rather than globally
+        new_vectors = model.encode(
+            [texts[i] for i in misses.values()],
+            batch_size=64, show_progress_bar=True, normalize_embeddings=True,
+        )
+        miss_df = pd.DataFrame({
+            'key': list(misses),
+            'vec': [v.tolist() for v in new_vectors],
+        })
+        con.register("miss_df", miss_df)
+        con.execute("INSERT OR REPLACE INTO market_embeddings SELECT key, vec FROM miss_df")
+        con.unregister("miss_df")
+        for key, vector in zip(misses, new_vectors):
+            cache[key] = vector
+
+    return np.vstack([np.asarray(cache[key], dtype=np.float32) for key in keys])
+
+def correlate_dense(kalshi_df, poly_df, kalshi_embeddings, poly_embeddings, threshold: float) -> pd.DataFrame:
+    """Find correlated pairs via a full similarity matrix. Best for small corpora."""
+    print("Calculating similarity matrix...")
+    # With unit-normalized embeddings, cosine similarity is just a matmul
+    similarity_matrix = kalshi_embeddings @ poly_embeddings.T
+
+    print(f"Finding matches with similarity > {threshold}...")
+
+    # Scan the matrix in C instead of iterating NxM pairs in Python
+    idx = np.argwhere(similarity_matrix > threshold)
+    scores = similarity_matrix[idx[:, 0], idx[:, 1]]
+
+    # Sort by score descending
+    order = np.argsort(-scores)
+    idx = idx[order]
+    scores = scores[order]
+
+    # Single columnar gather straight from the underlying arrays — no per-match
+    # iloc lookups or Series boxing
+    return pd.DataFrame({
+        'score': scores,
+        'kalshi_ticker': kalshi_df['ticker'].to_numpy()[idx[:, 0]],
+        'kalshi_title': kalshi_df['title'].to_numpy()[idx[:, 0]],
+        'poly_ticker': poly_df['ticker'].to_numpy()[idx[:, 1]],
+        'poly_title': poly_df['title'].to_numpy()[idx[:, 1]],
+    })
+
+def correlate_ann(kalshi_df, poly_df, kalshi_embeddings, poly_embeddings, threshold: float) -> pd.DataFrame:
+    """Find correlated pairs via ANN search over a LanceDB index of the Polymarket side.
+
+    Scales to corpora where the dense NxM matrix would not fit in memory:
+    memory is O(N*k) and each query is sub-linear in the Polymarket count.
+    """
+    print("Building LanceDB ANN index for Polymarket embeddings...")
+    if os.path.exists(LANCE_PATH):
+        shutil.rmtree(LANCE_PATH)
+    store = LanceStore(LANCE_PATH)
+
+    store.add_markets([
+        MarketEmbedding(
+            id=f"{row.source}:{row.ticker}",
+            vector=vector.tolist(),
+            ticker=row.ticker,
+            source=row.source,
+            title=row.title,
+            description=row.description,
+            outcomes=row.outcomes,
+        )
+        for row, vector in zip(poly_df.itertuples(index=False), poly_embeddings)
+    ])
+    store.create_index()
+
+    print(f"Finding matches with similarity > {threshold}...")
+    # One batched call: the store opens the table and index once and runs
+    # the per-market queries concurrently on the Rust side
+    result_batches = store.search_batch(
+        [vector.tolist() for vector in kalshi_embeddings], limit=ANN_TOP_K
+    )
+
+    matches = []
+    for (_, kalshi_row), results in zip(kalshi_df.iterrows(), result_batches):
+        for r in results:
+            # Embeddings are unit-normalized, so cosine = 1 - squared-L2 / 2
+            score = 1.0 - r['distance'] / 2.0
+            if score > threshold:
+                matches.append({
+                    'score': score,
+                    'kalshi_ticker': kalshi_row['ticker'],
+                    'kalshi_title': kalshi_row['title'],
+                    'poly_ticker': r['ticker'],
+                    'poly_title': r['title'],
+                })
+
+    out = pd.DataFrame(
+        matches,
+        columns=['score', 'kalshi_ticker', 'kalshi_title', 'poly_ticker', 'poly_title'],
+    )
+    # Sort by score descending
+    return out.sort_values('score', ascending=False, ignore_index=True)
 
 def correlate_markets(con: duckdb.DuckDBPyConnection, threshold: float = 0.75):
     """Load markets, generate embeddings, and find correlations."""
     print("Loading markets from database...")
-    df = con.execute("SELECT ticker, title, description, outcomes, source FROM markets").fetchdf()
+    # Fetch as Arrow and keep strings Arrow-backed in pandas: no per-string
+    # Python objects, and the vectorized text assembly below stays columnar
+    tbl = con.execute("SELECT ticker, title, description, outcomes, source FROM markets").arrow()
+    df = tbl.to_pandas(types_mapper=pd.ArrowDtype)
     
     if df.empty:
         print("No markets found in database.")
@@ -104,54 +226,55 @@ def correlate_markets(con: duckdb.DuckDBPyConnection, threshold: float = 0.75):
         return
 
     print("Generating embeddings (this may take a moment)...")
-    # Use a lightweight but effective model
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    
-    def make_rich_text(row):
-        parts = [f"Title: {row['title']}"]
-        if row['description']:
-            parts.append(f"Description: {row['description']}")
-        if row['outcomes']:
-            parts.append(f"Outcomes: {row['outcomes']}")
-        return "\n".join(parts)
-
-    kalshi_texts = kalshi_df.apply(make_rich_text, axis=1).tolist()
-    poly_texts = poly_df.apply(make_rich_text, axis=1).tolist()
-    
-    kalshi_embeddings = model.encode(kalshi_texts)
-    poly_embeddings = model.encode(poly_texts)
-    
-    print("Calculating similarity matrix...")
-    similarity_matrix = cosine_similarity(kalshi_embeddings, poly_embeddings)
-    
-    print(f"Finding matches with similarity > {threshold}...")
-    matches = []
-    
-    for i in range(len(kalshi_df)):
-        for j in range(len(poly_df)):
-            score = similarity_matrix[i][j]
-            if score > threshold:
-                matches.append({
-                    'score': score,
-                    'kalshi_ticker': kalshi_df.iloc[i]['ticker'],
-                    'kalshi_title': kalshi_df.iloc[i]['title'],
-                    'poly_ticker': poly_df.iloc[j]['ticker'],
-                    'poly_title': poly_df.iloc[j]['title']
-                })
-    
-    # Sort by score descending
-    matches.sort(key=lambda x: x['score'], reverse=True)
+
+    # One intra-op pool across all cores, no inter-op parallelism: the right
+    # balance for batch encoding. With the ONNX backend this only governs the
+    # torch ops around the model (tokenization, pooling), but costs nothing.
+    try:
+        torch.set_num_threads(os.cpu_count() or 4)
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # thread pools already initialized; keep whatever torch picked
+
+    # Use a lightweight but effective model.
+    # The int8-quantized ONNX variant is ~2-4x faster than PyTorch FP32 on CPU
+    # with negligible impact on cosine-similarity ranking.
+    model = SentenceTransformer(
+        'sentence-transformers/all-MiniLM-L6-v2',
+        backend='onnx',
+        model_kwargs={'file_name': 'onnx/model_quint8_avx2.onnx'},
+    )
     
+    def make_rich_texts(frame: pd.DataFrame) -> List[str]:
+        # Vectorized pandas string concat instead of a per-row apply
+        desc = frame['description'].fillna('')
+        outcomes = frame['outcomes'].fillna('')
+        texts = "Title: " + frame['title'].fillna('')
+        texts = texts + ("\nDescription: " + desc).where(desc != '', '')
+        texts = texts + ("\nOutcomes: " + outcomes).where(outcomes != '', '')
+        return texts.tolist()
+
+    kalshi_texts = make_rich_texts(kalshi_df)
+    poly_texts = make_rich_texts(poly_df)
+
+    kalshi_embeddings = encode_cached(model, con, kalshi_texts)
+    poly_embeddings = encode_cached(model, con, poly_texts)
+
+    if len(kalshi_df) * len(poly_df) > ANN_PAIR_LIMIT:
+        matches = correlate_ann(kalshi_df, poly_df, kalshi_embeddings, poly_embeddings, threshold)
+    else:
+        matches = correlate_dense(kalshi_df, poly_df, kalshi_embeddings, poly_embeddings, threshold)
+
     # Output results
     print(f"\nFound {len(matches)} correlations:")
     print("-" * 80)
-    print(f"{'Score':<6} | {'Kalshi Title':<35} | {'Polymarket Title':<35}")
-    print("-" * 80)
-    
-    for m in matches[:50]:  # Show top 50
-        k_title = (m['kalshi_title'][:32] + '..') if len(m['kalshi_title']) > 32 else m['kalshi_title']
-        p_title = (m['poly_title'][:32] + '..') if len(m['poly_title']) > 32 else m['poly_title']
-        print(f"{m['score']:.4f} | {k_title:<35} | {p_title:<35}")
+
+    # Truncate titles vectorized and emit the top 50 in one shot
+    top = matches.head(50).copy()
+    for col in ('kalshi_title', 'poly_title'):
+        titles = top[col].astype(str)
+        top[col] = titles.where(titles.str.len() <= 32, titles.str.slice(0, 32) + '..')
+    print(top.to_string(index=False, float_format='{:.4f}'.format))
 
 def export_to_s3(con: duckdb.DuckDBPyConnection, bucket: str, path: str):
     """Export the markets table to S3 (Parquet format)."""
@@ -164,9 +287,14 @@ def export_to_s3(con: duckdb.DuckDBPyConnection, bucket: str, path: str):
         # Note: If credentials aren't picked up automatically, you can set them:
         # con.execute("SET s3_access_key_id='...';")
         # con.execute("SET s3_secret_access_key='...';")
-        
-        # Export to Parquet using the s3:// protocol
-        query = f"COPY markets TO 's3://{bucket}/{path}' (FORMAT PARQUET);"
+
+        # Let DuckDB's Parquet writer use all cores
+        con.execute(f"SET threads={os.cpu_count() or 4};")
+
+        # Export to Parquet using the s3:// protocol.
+        # ZSTD + large row groups: we write once and read many times, so
+        # favor compression ratio and scan speed over write-side defaults.
+        query = f"COPY markets TO 's3://{bucket}/{path}' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 1000000);"
         con.execute(query)
         print("Export complete.")
     except Exception as e:
@@ -188,19 +316,15 @@ def main():
         print("Could not import UnipredCore. Ensure the native extension is built.")
         sys.exit(1)
 
+    if args.action in ['ingest', 'all']:
+        # The Rust engine opens the DuckDB file itself, so ingest before we
+        # take our own connection to avoid two writers on the same file
+        ingest_markets(core)
+
     # Initialize DuckDB
     con = duckdb.connect(DB_PATH)
     init_db(con)
 
-    if args.action in ['ingest', 'all']:
-        # Ingest Kalshi
-        # Try fetching default (usually open) and explicitly closed if supported.
-        ingest_markets(core, con, "kalshi", status="active")
-        ingest_markets(core, con, "kalshi", status="closed")
-        
-        # Ingest Polymarket
-        ingest_markets(core, con, "polymarket")
-
     if args.action in ['correlate', 'all']:
         correlate_markets(con, threshold=args.threshold)
 
@@ -1,7 +1,6 @@
 import os
 import sys
 import argparse
-import tempfile
 from dotenv import load_dotenv
 from unipred import UnipredCore
 
@@ -29,20 +28,13 @@ def main():
 
     if key_id and private_key:
         print(f"Logging in to Kalshi with Key ID: {key_id}...")
-        # Create temporary file for private key since binding expects a path
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            f.write(private_key)
-            temp_key_path = f.name
-
         try:
-            core.login_apikey(key_id, temp_key_path)
+            # PEM content goes straight to the binding; no tempfile needed
+            core.login_apikey_pem(key_id, private_key)
             print("Login successful.")
         except Exception as e:
             print(f"Login failed: {e}")
             sys.exit(1)
-        finally:
-            if os.path.exists(temp_key_path):
-                os.unlink(temp_key_path)
     else:
         print("Warning: KALSHI_API_KEY_ID or KALSHI_PRIVATE_KEY not set. Kalshi fetch may fail or be limited.")
 
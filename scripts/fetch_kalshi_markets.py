@@ -1,7 +1,8 @@
 import os
 import json
 import duckdb
-import tempfile
+import pandas as pd
+import xxhash
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 from unipred.unipred_py import UnipredCore
@@ -21,24 +22,15 @@ def main():
     # The config string is currently unused by the core implementation
     core = UnipredCore("{}")
 
-    # Create temporary file for private key since binding expects a path
-    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-        f.write(private_key)
-        temp_key_path = f.name
-
     print(f"Logging in with API Key ID: {key_id}...")
     try:
-        core.login_apikey(key_id, temp_key_path)
+        # PEM content goes straight to the binding; no tempfile needed
+        core.login_apikey_pem(key_id, private_key)
         print("Login successful.")
     except Exception as e:
         print(f"Login failed: {e}")
-        if os.path.exists(temp_key_path):
-            os.unlink(temp_key_path)
         return
 
-    if os.path.exists(temp_key_path):
-        os.unlink(temp_key_path)
-
     # 3. Define Time Range
     # "Close by Jan 2nd". Assuming Jan 2nd 2026 based on current late 2025 date.
     target_date = datetime(2026, 1, 2, 23, 59, 59, tzinfo=timezone.utc)
@@ -49,6 +41,9 @@ def main():
     # 4. Fetch Loop
     cursor = None
     all_markets = []
+    # Dedup on 64-bit ticker digests: pagination can shift under us and
+    # repeat markets, and int digests are cheaper set members than strings
+    seen_tickers = set()
     page_count = 0
 
     while True:
@@ -71,8 +66,11 @@ def main():
         count = len(markets) if markets else 0
         print(f"Got {count} markets.")
 
-        if markets:
-            all_markets.extend(markets)
+        for market in markets or []:
+            key = xxhash.xxh3_64_intdigest(market.get("ticker", ""))
+            if key not in seen_tickers:
+                seen_tickers.add(key)
+                all_markets.append(market)
 
         cursor = next_cursor
         if not cursor:
@@ -91,19 +89,33 @@ def main():
     con = duckdb.connect(db_file)
     print(f"Connected to DuckDB: {db_file}")
 
-    # Use a temporary JSON file to bulk load into DuckDB
-    # This allows DuckDB to auto-infer the schema from the complex nested objects
-    temp_file = "temp_markets_dump.json"
+    # Register the accumulated pages as a single in-memory DataFrame so DuckDB
+    # scans it directly — no temp-file write/read/unlink cycle
     try:
-        with open(temp_file, "w") as f:
-            json.dump(all_markets, f)
+        df = pd.DataFrame(all_markets)
+        con.register("markets_df", df)
 
-        # Drop table if exists to start fresh
-        con.execute("DROP TABLE IF EXISTS raw_markets")
+        table_exists = con.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = 'raw_markets'"
+        ).fetchone()[0]
 
-        # Load JSON
         print("Loading data into table 'raw_markets'...")
-        con.execute(f"CREATE TABLE raw_markets AS SELECT * FROM read_json_auto('{temp_file}')")
+        if table_exists:
+            # Staged upsert on ticker: drop the stored rows for every ticker
+            # we just re-fetched, then insert the fresh page. Dedup still
+            # happens inside DuckDB's vectorized executor, but re-runs now
+            # refresh volume/prices/status instead of freezing the first
+            # ingested snapshot
+            con.execute("BEGIN TRANSACTION")
+            con.execute("""
+                DELETE FROM raw_markets
+                WHERE ticker IN (SELECT ticker FROM markets_df)
+            """)
+            con.execute("INSERT INTO raw_markets SELECT * FROM markets_df")
+            con.execute("COMMIT")
+        else:
+            con.execute("CREATE TABLE raw_markets AS SELECT * FROM markets_df")
+        con.unregister("markets_df")
 
         # Verify
         count = con.execute("SELECT count(*) FROM raw_markets").fetchone()[0]
@@ -127,12 +139,7 @@ def main():
     except Exception as e:
         print(f"Database error: {e}")
     finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
         con.close()
 
-if __name__ == "__main__":
-    main()
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -19,56 +19,77 @@ def main():
         sys.exit(1)
 
     try:
-        con = duckdb.connect(args.db_path)
-        
-        # Build query
-        query = "SELECT ticker, source, title, description, outcomes FROM markets WHERE 1=1"
-        params = []
+        # Lower the search term to DuckDB's specialized string predicates where
+        # possible: contains/starts_with/ends_with beat the generic LIKE
+        # machinery on unanchored patterns. Fall back to ILIKE only when the
+        # user typed their own embedded wildcards.
+        search = args.search
+        if search is None:
+            search_predicate = "$search IS NULL"
+        elif "%" not in search and "_" not in search:
+            search_predicate = "(contains(lower(title), $search) OR contains(lower(description), $search))"
+            search = search.lower()
+        elif search.endswith("%") and "%" not in search[:-1] and "_" not in search:
+            search_predicate = "(starts_with(lower(title), $search) OR starts_with(lower(description), $search))"
+            search = search[:-1].lower()
+        elif search.startswith("%") and "%" not in search[1:] and "_" not in search:
+            search_predicate = "(ends_with(lower(title), $search) OR ends_with(lower(description), $search))"
+            search = search[1:].lower()
+        else:
+            search_predicate = "(title ILIKE $search OR description ILIKE $search)"
 
-        if args.source:
-            query += " AND source = ?"
-            params.append(args.source)
-        
-        if args.ticker:
-            query += " AND ticker = ?"
-            params.append(args.ticker)
-            
-        if args.search:
-            query += " AND (title ILIKE ? OR description ILIKE ?)"
-            params.append(f"%{args.search}%")
-            params.append(f"%{args.search}%")
+        # One static query shape otherwise; NULL parameters disable their
+        # predicate, so DuckDB can cache a plan per argument combination
+        # Document text is assembled server-side so DuckDB's vectorized
+        # executor builds the strings in batches instead of a Python f-string
+        # per row. The expression mirrors the embedding input built in Rust:
+        # unipred-core/src/ingestion/mod.rs
+        # format!("Title: {}\nDescription: {}\nOutcomes: {}", ...)
+        query = f"""
+            SELECT ticker, source,
+                   concat('Title: ', title,
+                          chr(10), 'Description: ', description,
+                          chr(10), 'Outcomes: ', outcomes) AS doc
+            FROM markets
+            WHERE ($source IS NULL OR source = $source)
+              AND ($ticker IS NULL OR ticker = $ticker)
+              AND {search_predicate}
+            LIMIT $limit
+        """
+        params = {
+            "source": args.source,
+            "ticker": args.ticker,
+            "search": search,
+            "limit": args.limit,
+        }
 
-        query += " LIMIT ?"
-        params.append(args.limit)
+        # Read-only connection skips write-mode catalog init and the WAL scan;
+        # the context manager replaces the explicit close() for this one query.
+        # Fetch as Arrow so rows stay columnar instead of being converted to
+        # per-row Python tuples; scales to large --limit values
+        with duckdb.connect(args.db_path, read_only=True) as con:
+            tbl = con.execute(query, params).fetch_arrow_table()
 
-        results = con.execute(query, params).fetchall()
-
-        if not results:
+        if tbl.num_rows == 0:
             print("No markets found matching criteria.")
             return
 
-        print(f"Showing {len(results)} markets from '{args.db_path}':")
-        print("=" * 80)
+        # Accumulate the report and emit it in one write: per-row print()
+        # locks and flushes stdout each call, which dominates at large --limit
+        parts = [f"Showing {tbl.num_rows} markets from '{args.db_path}':", "=" * 80]
 
-        for row in results:
-            ticker, source, title, description, outcomes = row
-            
-            # Reconstruct the document text exactly as it was embedded in Rust
-            # Logic matches: unipred-core/src/ingestion/mod.rs
-            # format!("Title: {}\nDescription: {}\nOutcomes: {}", title, description, outcomes)
-            
-            # Note: 'outcomes' in DB is stored as a comma-separated string, 
-            # which matches the .join(", ") result used in ingestion.
-            
-            doc_text = f"Title: {title}\nDescription: {description}\nOutcomes: {outcomes}"
-            
-            print(f"MARKET: {ticker} ({source})")
-            print("-" * 80)
-            print(doc_text)
-            print("=" * 80)
-            print()
+        for ticker, source, doc_text in zip(
+            tbl.column('ticker').to_pylist(),
+            tbl.column('source').to_pylist(),
+            tbl.column('doc').to_pylist(),
+        ):
+            parts.append(f"MARKET: {ticker} ({source})")
+            parts.append("-" * 80)
+            parts.append(doc_text)
+            parts.append("=" * 80)
+            parts.append("")
 
-        con.close()
+        sys.stdout.write("\n".join(parts) + "\n")
 
     except Exception as e:
         print(f"Error inspecting database: {e}")
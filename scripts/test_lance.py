@@ -1,10 +1,113 @@
+import functools
+import queue
 import shutil
 import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pyarrow as pa
 from sentence_transformers import SentenceTransformer
-from unipred import LanceStore, MarketEmbedding
+from unipred import EmbeddingCache, LanceStore
 
 DB_PATH = "test_lance_db"
 
+# Below this many vectors a flat scan beats IVF-PQ: index training costs more
+# than it saves, and exact search is already sub-millisecond
+ANN_THRESHOLD = 1000
+
+# Markets per pipeline stage: the encoder fills one chunk while Lance writes
+# the previous one
+CHUNK_SIZE = 32
+
+# Persistent embedding cache, kept next to (not inside) the test database
+EMB_CACHE_PATH = DB_PATH + ".emb_cache"
+
+@functools.lru_cache(maxsize=1)
+def load_model(name: str = 'all-MiniLM-L6-v2') -> SentenceTransformer:
+    """Load the embedding model once per process."""
+    return SentenceTransformer(name)
+
+def encode_cached(model: SentenceTransformer, texts: list) -> np.ndarray:
+    """Encode texts through the shared content-addressed embedding cache."""
+    # Only unseen texts pay for the encoder; repeat runs are pure IO
+    with EmbeddingCache(EMB_CACHE_PATH) as cache:
+        return cache.get_or_compute(
+            texts,
+            lambda misses: model.encode(
+                misses,
+                batch_size=32, convert_to_numpy=True, normalize_embeddings=True,
+            ),
+        )
+
+def make_record_batch(markets: list, vectors: np.ndarray) -> pa.RecordBatch:
+    """Build one columnar batch for LanceStore.add_record_batch."""
+    # Hand Lance one columnar batch instead of a Python object per market:
+    # the vectors stay in a single float32 buffer all the way into Rust
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    vec_col = pa.FixedSizeListArray.from_arrays(
+        pa.array(vectors.reshape(-1)), vectors.shape[1]
+    )
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([f"{m['source']}:{m['ticker']}" for m in markets]),
+            vec_col,
+            pa.array([m['ticker'] for m in markets]),
+            pa.array([m['source'] for m in markets]),
+            pa.array([m['title'] for m in markets]),
+            pa.array([m['description'] for m in markets]),
+            pa.array([m['outcomes'] for m in markets]),
+        ],
+        names=["id", "vector", "ticker", "source", "title", "description", "outcomes"],
+    )
+
+def ingest_pipelined(store: LanceStore, model: SentenceTransformer, markets: list) -> int:
+    """
+    Encode and write markets as an overlapped two-stage pipeline.
+
+    The encoder releases the GIL inside torch kernels and Lance writes
+    release it in Rust, so one thread can encode chunk N+1 while the other
+    writes chunk N; total time approaches max(encode, write) instead of
+    their sum. Returns the number of markets written.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=2)
+
+    def write_chunks():
+        written = 0
+        while (batch := chunks.get()) is not None:
+            store.add_record_batch(batch)
+            written += batch.num_rows
+        return written
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        writer = executor.submit(write_chunks)
+
+        def put_guarded(item) -> bool:
+            # Bounded put that gives up once the writer has died, so a failed
+            # write can't leave the encoder blocked on a full queue
+            while not writer.done():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def encode_chunks():
+            try:
+                for start in range(0, len(markets), CHUNK_SIZE):
+                    chunk = markets[start:start + CHUNK_SIZE]
+                    texts = [
+                        f"Title: {m['title']}\nDescription: {m['description']}\nOutcomes: {m['outcomes']}"
+                        for m in chunk
+                    ]
+                    if not put_guarded(make_record_batch(chunk, encode_cached(model, texts))):
+                        return  # Write failed; its exception surfaces from writer.result()
+            finally:
+                put_guarded(None)  # Sentinel so a live writer terminates
+
+        encoder = executor.submit(encode_chunks)
+        encoder.result()
+        return writer.result()
+
 def main():
     # Clean up previous test run
     if os.path.exists(DB_PATH):
@@ -38,36 +141,23 @@ def main():
         }
     ]
 
-    print("Generating embeddings...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    
-    embeddings = []
-    for m in markets:
-        # Create rich text representation
-        text = f"Title: {m['title']}\nDescription: {m['description']}\nOutcomes: {m['outcomes']}"
-        vector = model.encode(text).tolist()
-        
-        embeddings.append(MarketEmbedding(
-            id=f"{m['source']}:{m['ticker']}",
-            vector=vector,
-            ticker=m['ticker'],
-            source=m['source'],
-            title=m['title'],
-            description=m['description'],
-            outcomes=m['outcomes']
-        ))
-
-    print(f"Adding {len(embeddings)} markets to LanceDB...")
-    store.add_markets(embeddings)
-
-    # Skip index creation for small dataset
-    # print("Creating index...")
-    # store.create_index()
+    print("Generating embeddings and writing to LanceDB...")
+    model = load_model()
+    written = ingest_pipelined(store, model, markets)
+    print(f"Added {written} markets to LanceDB.")
+
+    if written >= ANN_THRESHOLD:
+        # HNSW: O(log n) graph search instead of a linear scan; pass
+        # ef_search to store.search() to trade recall for latency per query
+        print("Creating HNSW index...")
+        store.create_index_hnsw()
+    else:
+        print(f"Skipping index creation ({written} < {ANN_THRESHOLD} vectors); using flat scan.")
 
     # 2. Search
     search_text = "Who will be president?"
     print(f"\nSearching for: '{search_text}'")
-    query_vector = model.encode(search_text).tolist()
+    query_vector = encode_cached(model, [search_text])[0].tolist()
     
     results = store.search(query_vector, limit=2)
 
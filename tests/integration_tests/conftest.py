@@ -1,13 +1,94 @@
 import os
 import pytest
-import tempfile
+import shelve
 from collections.abc import Generator
+from pathlib import Path
 from dotenv import load_dotenv
 from unipred import UnipredCore
+from unipred.market_quote_pb2 import FetchedMarketList, MarketQuote
 
 # Load environment variables from .env file if present
 load_dotenv()
 
+# Recorded API responses live next to the tests; first run (or --live) records,
+# later runs replay from disk so the suite is not network-RTT bound
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+def pytest_collection_modifyitems(session, config, items):
+    # Guard against duplicated test modules: the same test class defined in
+    # two modules silently runs the whole live-API matrix twice. Fail
+    # collection instead of paying the redundant network calls.
+    class_modules = {}
+    for item in items:
+        if item.cls is not None:
+            class_modules.setdefault(item.cls.__name__, set()).add(item.module.__name__)
+    duplicates = {name: mods for name, mods in class_modules.items() if len(mods) > 1}
+    if duplicates:
+        details = "; ".join(
+            f"{name} in {', '.join(sorted(mods))}" for name, mods in duplicates.items()
+        )
+        raise pytest.UsageError(f"Duplicate test classes collected: {details}")
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live",
+        action="store_true",
+        default=False,
+        help="Bypass recorded cassettes and re-record responses from the live APIs.",
+    )
+
+class _CassetteCore:
+    """
+    Replay wrapper around UnipredCore for the read-only calls the tests use.
+
+    Responses are stored as serialized protobuf bytes keyed by the call
+    arguments. Recording happens at the protobuf boundary because the HTTP
+    traffic itself lives inside the Rust client, out of reach of
+    vcrpy-style patching. Failed calls are never recorded, so error-path
+    tests always exercise the live client.
+    """
+
+    def __init__(self, inner: UnipredCore, path: Path, live: bool):
+        self._inner = inner
+        self._live = live
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache = shelve.open(str(path))
+
+    def close(self) -> None:
+        self._cache.close()
+
+    def _replay_or_record(self, key, fetch, message_cls):
+        if self._live or key not in self._cache:
+            # Copy out via bytes: the core reuses its response messages in
+            # place, so the live object must not escape the wrapper
+            self._cache[key] = fetch().SerializeToString()
+        # Both hit and record paths return a fresh parse; tests comparing two
+        # responses (e.g. pagination pages) would otherwise alias one message
+        msg = message_cls()
+        msg.ParseFromString(self._cache[key])
+        return msg
+
+    def fetch_markets(self, exchange=None, limit=100, cursor=None, status=None):
+        key = f"fetch_markets:{exchange}:{limit}:{cursor}:{status}"
+        return self._replay_or_record(
+            key,
+            lambda: self._inner.fetch_markets(
+                exchange=exchange, limit=limit, cursor=cursor, status=status
+            ),
+            FetchedMarketList,
+        )
+
+    def get_quote(self, ticker, exchange=None):
+        key = f"get_quote:{ticker}:{exchange}"
+        return self._replay_or_record(
+            key,
+            lambda: self._inner.get_quote(ticker, exchange=exchange),
+            MarketQuote,
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
 @pytest.fixture(scope="session")
 def kalshi_credentials():
     """
@@ -16,30 +97,30 @@ def kalshi_credentials():
     """
     key_id = os.getenv("KALSHI_API_KEY_ID")
     private_key = os.getenv("KALSHI_PRIVATE_KEY")
-    
+
     if not key_id or not private_key:
         pytest.skip("Skipping integration tests: KALSHI_API_KEY_ID and KALSHI_PRIVATE_KEY environment variables must be set.")
-        
+
     return key_id, private_key
 
-@pytest.fixture(scope="function")
-def core(kalshi_credentials: tuple[str, str]) -> Generator[UnipredCore, None, None]:
+@pytest.fixture(scope="session")
+def core(request, kalshi_credentials: tuple[str, str]) -> Generator[UnipredCore, None, None]:
     """
-    Provides an authenticated UnipredCore instance.
-    Handles the creation and cleanup of the temporary private key file required by the Rust client.
+    Provides an authenticated UnipredCore instance, shared across the session.
+    Login is read-only setup, so one client can safely serve every test instead
+    of re-authenticating per function.
+    Responses are recorded to and replayed from cassettes/ unless --live is set.
     """
     key_id, private_key = kalshi_credentials
-    
-    # Create temporary file for private key since the Rust binding expects a file path
-    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-        f.write(private_key)
-        temp_key_path = f.name
-        
+
+    # The PEM goes straight to the Rust client; no tempfile, and the secret
+    # never touches disk
+    client = UnipredCore("{}")
+    client.login_apikey_pem(key_id, private_key)
+    cassette = _CassetteCore(
+        client, CASSETTE_DIR / "responses", request.config.getoption("--live")
+    )
     try:
-        client = UnipredCore("{}")
-        client.login_apikey(key_id, temp_key_path)
-        yield client
+        yield cassette
     finally:
-        # Cleanup temporary file
-        if os.path.exists(temp_key_path):
-            os.unlink(temp_key_path)
\ No newline at end of file
+        cassette.close()
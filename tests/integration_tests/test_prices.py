@@ -3,12 +3,15 @@ from unipred.market_quote_pb2 import MarketQuote
 
 # All these should be valid tickers that should return something.
 # If they don't due to market being deleted etc, remove them.
+# Cases are grouped by exchange for pytest-xdist (-n auto --dist loadgroup):
+# the calls are independent and network-bound, so they parallelize freely,
+# but keeping one exchange per worker respects per-exchange rate limits.
 GOOD_TICKERS = [
-    ("KXLINKMINY-25-10", None),
-    ("KXELONMARS-99", None),
-    ("KXCOLONIZEMARS-50", None),
-    ("KXNEWPOPE-70-PPIZ", None),
-    ("36725157385158152303355940271421346899386884953712631735038848833359115722560", "polymarket")
+    pytest.param("KXLINKMINY-25-10", None, marks=pytest.mark.xdist_group("kalshi")),
+    pytest.param("KXELONMARS-99", None, marks=pytest.mark.xdist_group("kalshi")),
+    pytest.param("KXCOLONIZEMARS-50", None, marks=pytest.mark.xdist_group("kalshi")),
+    pytest.param("KXNEWPOPE-70-PPIZ", None, marks=pytest.mark.xdist_group("kalshi")),
+    pytest.param("36725157385158152303355940271421346899386884953712631735038848833359115722560", "polymarket", marks=pytest.mark.xdist_group("polymarket"))
 ]
 BAD_TICKERS = ["KX_ASDASASXZX!@3",
     "0xd903891c2b9046cae14615afc4c5245370143503f7b2dfc13919acee07a1696x"
@@ -29,10 +32,12 @@ class TestPrices:
         assert quote.price
         assert quote.timestamp
 
+    @pytest.mark.xdist_group("kalshi")
     @pytest.mark.parametrize(
         ("ticker"),
         BAD_TICKERS
     )
     def test_bad_tickers(self, core, ticker):
-        with pytest.raises(Exception): # todo scope to specific exception
+        # Syntactically invalid tickers are rejected before any network call
+        with pytest.raises(ValueError):
             core.get_quote(ticker)
@@ -4,8 +4,76 @@ use crate::UnipredCore;
 use crate::domain::MarketSource;
 use async_trait::async_trait;
 use anyhow::Result;
+use arrow_array::builder::{ListBuilder, StringBuilder};
+use arrow_array::{RecordBatch, StringArray};
+use arrow_ipc::writer::StreamWriter;
+use arrow_schema::{DataType, Field, Schema};
+use std::collections::HashMap;
+use std::sync::Arc;
 use crate::proto::{FetchedMarket, FetchedMarketList};
 
+/// Serialize a fetched market list as an Arrow IPC stream.
+///
+/// Columnar consumers (DuckDB, pandas) can then ingest the whole page in one
+/// registration instead of crossing the protobuf boundary per field. The
+/// pagination cursor travels in the schema metadata under the "cursor" key.
+pub fn market_list_to_arrow_ipc(list: &FetchedMarketList) -> Result<Vec<u8>> {
+    let mut metadata = HashMap::new();
+    metadata.insert("cursor".to_string(), list.cursor.clone());
+
+    let schema = Arc::new(Schema::new_with_metadata(
+        vec![
+            Field::new("ticker", DataType::Utf8, false),
+            Field::new("title", DataType::Utf8, false),
+            Field::new("description", DataType::Utf8, true),
+            Field::new(
+                "outcomes",
+                DataType::List(Arc::new(Field::new("item", DataType::Utf8, true))),
+                true,
+            ),
+            Field::new("source", DataType::Utf8, false),
+            Field::new("status", DataType::Utf8, true),
+        ],
+        metadata,
+    ));
+
+    let tickers = StringArray::from_iter_values(list.markets.iter().map(|m| m.ticker.as_str()));
+    let titles = StringArray::from_iter_values(list.markets.iter().map(|m| m.title.as_str()));
+    let descriptions =
+        StringArray::from_iter_values(list.markets.iter().map(|m| m.description.as_str()));
+    let sources = StringArray::from_iter_values(list.markets.iter().map(|m| m.source.as_str()));
+    let statuses = StringArray::from_iter_values(list.markets.iter().map(|m| m.status.as_str()));
+
+    let mut outcomes_builder = ListBuilder::new(StringBuilder::new());
+    for m in &list.markets {
+        for outcome in &m.outcomes {
+            outcomes_builder.values().append_value(outcome);
+        }
+        outcomes_builder.append(true);
+    }
+    let outcomes = outcomes_builder.finish();
+
+    let batch = RecordBatch::try_new(
+        schema.clone(),
+        vec![
+            Arc::new(tickers),
+            Arc::new(titles),
+            Arc::new(descriptions),
+            Arc::new(outcomes),
+            Arc::new(sources),
+            Arc::new(statuses),
+        ],
+    )?;
+
+    let mut buf = Vec::new();
+    {
+        let mut writer = StreamWriter::try_new(&mut buf, &schema)?;
+        writer.write(&batch)?;
+        writer.finish()?;
+    }
+    Ok(buf)
+}
+
 pub struct FetchMarkets {
     pub exchange: Option<MarketSource>,
     pub limit: Option<i64>,
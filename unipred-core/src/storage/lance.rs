@@ -4,7 +4,7 @@ use arrow_array::{
 };
 use arrow_schema::{DataType, Field, Schema};
 use futures::TryStreamExt;
-use lancedb::{Connection, index::Index, query::{ExecutableQuery, QueryBase}};
+use lancedb::{Connection, index::Index, index::vector::{IvfHnswSqIndexBuilder, IvfPqIndexBuilder}, query::{ExecutableQuery, QueryBase}};
 use std::sync::Arc;
 
 pub const VECTOR_DIM: i32 = 384; // Using all-MiniLM-L6-v2 dimension
@@ -115,6 +115,37 @@ impl LanceStore {
         Ok(())
     }
 
+    /// Add markets from an Arrow IPC stream matching the markets schema.
+    ///
+    /// Callers that already hold columnar data (e.g. the Python bindings with
+    /// a pyarrow RecordBatch) can hand the whole batch over in one buffer
+    /// instead of materializing a MarketEmbedding per row.
+    pub async fn add_markets_ipc(&self, ipc: &[u8]) -> Result<()> {
+        let reader = arrow_ipc::reader::StreamReader::try_new(std::io::Cursor::new(ipc), None)?;
+        let schema = reader.schema();
+        let batches = reader.collect::<std::result::Result<Vec<RecordBatch>, _>>()?;
+
+        if batches.iter().all(|b| b.num_rows() == 0) {
+            return Ok(());
+        }
+
+        let batches = RecordBatchIterator::new(batches.into_iter().map(Ok), schema);
+
+        let table_exists = self.conn.table_names().execute().await?.contains(&TABLE_NAME.to_string());
+
+        if table_exists {
+            let table = self.conn.open_table(TABLE_NAME).execute().await?;
+            table.add(Box::new(batches)).execute().await?;
+        } else {
+            self.conn
+                .create_table(TABLE_NAME, Box::new(batches))
+                .execute()
+                .await?;
+        }
+
+        Ok(())
+    }
+
     /// Add events to the store.
     pub async fn add_events(&self, events: Vec<EventEmbedding>) -> Result<()> {
         if events.is_empty() {
@@ -145,10 +176,43 @@ impl LanceStore {
     }
 
     /// Create an IVF-PQ index on the vector column for fast search.
+    ///
+    /// Explicit PQ parameters: 4 dimensions per sub-vector, quantized to
+    /// 8 bits each, stores every vector in VECTOR_DIM/4 bytes instead of
+    /// VECTOR_DIM*4 — a 16x cut in scan footprint for small recall loss.
     pub async fn create_index(&self) -> Result<()> {
         let table = self.conn.open_table(TABLE_NAME).execute().await?;
         table
-            .create_index(&["vector"], Index::Auto)
+            .create_index(
+                &["vector"],
+                Index::IvfPq(
+                    IvfPqIndexBuilder::default()
+                        .num_sub_vectors(VECTOR_DIM as u32 / 4)
+                        .num_bits(8),
+                ),
+            )
+            .execute()
+            .await?;
+        Ok(())
+    }
+
+    /// Create an IVF-HNSW-SQ index on the vector column.
+    ///
+    /// Graph traversal scales O(log n) with corpus size versus the linear
+    /// scan of a flat table, at ~95-99% recall. `m` is the number of graph
+    /// edges per node and `ef_construction` the candidate-list size while
+    /// building; search-time breadth is set per query via `ef_search`.
+    pub async fn create_index_hnsw(&self, m: u32, ef_construction: u32) -> Result<()> {
+        let table = self.conn.open_table(TABLE_NAME).execute().await?;
+        table
+            .create_index(
+                &["vector"],
+                Index::IvfHnswSq(
+                    IvfHnswSqIndexBuilder::default()
+                        .num_edges(m)
+                        .ef_construction(ef_construction),
+                ),
+            )
             .execute()
             .await?;
         Ok(())
@@ -157,30 +221,89 @@ impl LanceStore {
     pub async fn create_events_index(&self) -> Result<()> {
         let table = self.conn.open_table(EVENTS_TABLE_NAME).execute().await?;
         table
-            .create_index(&["vector"], Index::Auto)
+            .create_index(
+                &["vector"],
+                Index::IvfPq(
+                    IvfPqIndexBuilder::default()
+                        .num_sub_vectors(VECTOR_DIM as u32 / 4)
+                        .num_bits(8),
+                ),
+            )
             .execute()
             .await?;
         Ok(())
     }
 
     /// Search for similar markets using a query vector.
-    pub async fn search(&self, query_vector: Vec<f32>, limit: usize) -> Result<Vec<MarketEmbedding>> {
+    /// Returns each match together with its distance to the query.
+    ///
+    /// `ef_search` widens the candidate list when an HNSW index is present;
+    /// `None` keeps the engine default and is ignored by flat/IVF search.
+    pub async fn search(
+        &self,
+        query_vector: Vec<f32>,
+        limit: usize,
+        ef_search: Option<usize>,
+    ) -> Result<Vec<(MarketEmbedding, f32)>> {
         let table = self.conn.open_table(TABLE_NAME).execute().await?;
-        
+
         // Ensure query vector size matches dimension
         if query_vector.len() != VECTOR_DIM as usize {
             anyhow::bail!("Query vector dimension mismatch. Expected {}, got {}", VECTOR_DIM, query_vector.len());
         }
 
-        let results = table
-            .query()
-            .nearest_to(query_vector)?
-            .limit(limit)
+        let mut query = table.query().nearest_to(query_vector)?.limit(limit);
+        if let Some(ef) = ef_search {
+            query = query.ef(ef);
+        }
+
+        let results = query
             .execute()
             .await?
             .try_collect::<Vec<_>>()
             .await?;
 
+        Ok(Self::collect_market_results(results))
+    }
+
+    /// Search for similar markets for a batch of query vectors.
+    ///
+    /// Opens the table once and issues the queries concurrently, so callers
+    /// pay the table and index setup a single time instead of per vector.
+    pub async fn search_batch(
+        &self,
+        query_vectors: Vec<Vec<f32>>,
+        limit: usize,
+        ef_search: Option<usize>,
+    ) -> Result<Vec<Vec<(MarketEmbedding, f32)>>> {
+        let table = self.conn.open_table(TABLE_NAME).execute().await?;
+
+        for query_vector in &query_vectors {
+            if query_vector.len() != VECTOR_DIM as usize {
+                anyhow::bail!("Query vector dimension mismatch. Expected {}, got {}", VECTOR_DIM, query_vector.len());
+            }
+        }
+
+        let queries = query_vectors.into_iter().map(|query_vector| {
+            let table = table.clone();
+            async move {
+                let mut query = table.query().nearest_to(query_vector)?.limit(limit);
+                if let Some(ef) = ef_search {
+                    query = query.ef(ef);
+                }
+                let results = query
+                    .execute()
+                    .await?
+                    .try_collect::<Vec<_>>()
+                    .await?;
+                anyhow::Ok(Self::collect_market_results(results))
+            }
+        });
+
+        futures::future::try_join_all(queries).await
+    }
+
+    fn collect_market_results(results: Vec<RecordBatch>) -> Vec<(MarketEmbedding, f32)> {
         let mut markets = Vec::new();
 
         for batch in results {
@@ -195,8 +318,13 @@ impl LanceStore {
             let descriptions = batch.column(5).as_any().downcast_ref::<StringArray>().unwrap();
             let outcomes = batch.column(6).as_any().downcast_ref::<StringArray>().unwrap();
 
+            // LanceDB appends the query distance as a "_distance" column
+            let distances = batch
+                .column_by_name("_distance")
+                .and_then(|c| c.as_any().downcast_ref::<Float32Array>());
+
             for i in 0..batch.num_rows() {
-                markets.push(MarketEmbedding {
+                let market = MarketEmbedding {
                     id: ids.value(i).to_string(),
                     vector: vec![], // Omitted for efficiency/simplicity in read-path
                     ticker: tickers.value(i).to_string(),
@@ -204,11 +332,13 @@ impl LanceStore {
                     title: titles.value(i).to_string(),
                     description: descriptions.value(i).to_string(),
                     outcomes: outcomes.value(i).to_string(),
-                });
+                };
+                let distance = distances.map(|d| d.value(i)).unwrap_or(0.0);
+                markets.push((market, distance));
             }
         }
 
-        Ok(markets)
+        markets
     }
 
     /// Search for similar events using a query vector.
@@ -3,7 +3,7 @@ use pyo3::prelude::*;
 use pyo3::types::PyBytes;
 use unipred_core::UnipredCore as CoreUnipred;
 use unipred_core::commands::quote::GetMarketQuote;
-use unipred_core::commands::markets::FetchMarkets;
+use unipred_core::commands::markets::{market_list_to_arrow_ipc, FetchMarkets};
 use unipred_core::commands::Command;
 use unipred_core::storage::lance::{LanceStore, MarketEmbedding};
 use unipred_core::ingestion::{IngestionEngine, IngestionFilter};
@@ -46,6 +46,19 @@ impl UnipredCore {
         }
     }
 
+    fn login_apikey_pem(&mut self, key_id: String, pem: String) -> PyResult<()> {
+        // In-memory variant: takes the PEM content itself, so callers holding
+        // the key in an env var don't have to round-trip it through a tempfile
+        let result = self.rt.block_on(async {
+            self.inner.kalshi.login_apikey(&key_id, &pem).await
+        });
+
+        match result {
+            Ok(_) => Ok(()),
+            Err(e) => Err(pyo3::exceptions::PyRuntimeError::new_err(e.to_string())),
+        }
+    }
+
     #[pyo3(signature = (exchange=None, limit=100, cursor=None, status=None))]
     fn _fetch_markets_bytes(
         &self,
@@ -88,6 +101,48 @@ impl UnipredCore {
         }
     }
 
+    #[pyo3(signature = (exchange=None, limit=100, cursor=None, status=None))]
+    fn _fetch_markets_arrow(
+        &self,
+        exchange: Option<String>,
+        limit: i64,
+        cursor: Option<String>,
+        status: Option<String>,
+    ) -> PyResult<Py<PyBytes>> {
+        let source = match exchange.as_deref() {
+            Some("kalshi") => Some(unipred_core::domain::MarketSource::Kalshi),
+            Some("polymarket") => Some(unipred_core::domain::MarketSource::Polymarket),
+            Some(s) => return Err(pyo3::exceptions::PyValueError::new_err(format!("Unknown exchange: {}", s))),
+            None => None,
+        };
+
+        let mut cmd = FetchMarkets::new()
+            .with_limit(limit)
+            .with_exchange(source);
+
+        if let Some(c) = cursor {
+            cmd = cmd.with_cursor(c);
+        }
+        if let Some(s) = status {
+            cmd = cmd.with_status(s);
+        }
+
+        let result = self.rt.block_on(async {
+            cmd.execute(&self.inner).await
+        });
+
+        match result {
+            Ok(fetched_market_list) => {
+                // Emit the page as an Arrow IPC stream so the Python side can
+                // hand it to DuckDB/pandas without per-field protobuf access
+                let buf = market_list_to_arrow_ipc(&fetched_market_list)
+                    .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))?;
+                Python::with_gil(|py| Ok(PyBytes::new(py, &buf).into()))
+            }
+            Err(e) => Err(pyo3::exceptions::PyRuntimeError::new_err(e.to_string())),
+        }
+    }
+
     #[pyo3(signature = (ticker, exchange=None))]
     fn _get_quote_bytes(&self, ticker: String, exchange: Option<String>) -> PyResult<Py<PyBytes>> {
         let source = match exchange.as_deref() {
@@ -221,6 +276,16 @@ impl PyLanceDb {
         Ok(())
     }
 
+    fn add_record_batch(&self, data: &[u8]) -> PyResult<()> {
+        // Arrow IPC stream bytes, produced by pyarrow on the Python side; one
+        // boundary crossing for the whole batch instead of one per market
+        self.rt
+            .block_on(async { self.inner.add_markets_ipc(data).await })
+            .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))?;
+
+        Ok(())
+    }
+
     fn create_index(&self) -> PyResult<()> {
         self.rt
             .block_on(async { self.inner.create_index().await })
@@ -228,19 +293,28 @@ impl PyLanceDb {
         Ok(())
     }
 
+    fn create_index_hnsw(&self, m: u32, ef_construction: u32) -> PyResult<()> {
+        self.rt
+            .block_on(async { self.inner.create_index_hnsw(m, ef_construction).await })
+            .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))?;
+        Ok(())
+    }
+
+    #[pyo3(signature = (query_vector, limit, ef_search=None))]
     fn search(
         &self,
         query_vector: Vec<f32>,
         limit: usize,
-    ) -> PyResult<Vec<(String, String, String, String, String, String)>> {
+        ef_search: Option<usize>,
+    ) -> PyResult<Vec<(String, String, String, String, String, String, f32)>> {
         let results = self.rt
-            .block_on(async { self.inner.search(query_vector, limit).await })
+            .block_on(async { self.inner.search(query_vector, limit, ef_search).await })
             .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))?;
 
-        // Return simplified tuple: (id, ticker, source, title, description, outcomes)
+        // Return simplified tuple: (id, ticker, source, title, description, outcomes, distance)
         let py_results = results
             .into_iter()
-            .map(|m| {
+            .map(|(m, distance)| {
                 (
                     m.id,
                     m.ticker,
@@ -248,12 +322,48 @@ impl PyLanceDb {
                     m.title,
                     m.description,
                     m.outcomes,
+                    distance,
                 )
             })
             .collect();
 
         Ok(py_results)
     }
+
+    #[pyo3(signature = (query_vectors, limit, ef_search=None))]
+    fn search_batch(
+        &self,
+        query_vectors: Vec<Vec<f32>>,
+        limit: usize,
+        ef_search: Option<usize>,
+    ) -> PyResult<Vec<Vec<(String, String, String, String, String, String, f32)>>> {
+        let results = self.rt
+            .block_on(async { self.inner.search_batch(query_vectors, limit, ef_search).await })
+            .map_err(|e| pyo3::exceptions::PyRuntimeError::new_err(e.to_string()))?;
+
+        // One result list per query vector, same tuples as search()
+        let py_results = results
+            .into_iter()
+            .map(|batch| {
+                batch
+                    .into_iter()
+                    .map(|(m, distance)| {
+                        (
+                            m.id,
+                            m.ticker,
+                            m.source,
+                            m.title,
+                            m.description,
+                            m.outcomes,
+                            distance,
+                        )
+                    })
+                    .collect()
+            })
+            .collect();
+
+        Ok(py_results)
+    }
 }
 
 /// A Python module implemented in Rust.